@@ -1,89 +1,296 @@
+import asyncio
+import ijson
+import orjson
 import requests
-
-from json import load, dumps
+import urllib3
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b
+from json import dumps
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_STEP_MUSTS = frozenset({
+    'name', 'chain_id',
+    'url', 'method',
+    'output_path', 'output'
+})
+_STEP_DEFAULTS = {
+    'headers': None, 'parameters': None,
+    'payload': None, 'payload_type': None,
+    'dynamic_variables': None, 'iterables_order': None,
+    'backend': None
+}
+_OUTPUT_DEFAULTS = {
+    'is_chain_final': False,
+    'is_parser_final': False,
+    'key': None,
+    'stream': False
+}
+_DYNAMIC_VARIABLES_DEFAULTS = {
+    'iterables': None,
+    'standard': None
+}
+_BACKENDS = frozenset({None, 'requests', 'httpx', 'urllib3'})
+_TIMEOUT = (3.05, 30)  # (connect, read) seconds, shared by every backend
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+_STATUS_RETRIES = 3
+_RETRY_BACKOFF = 0.3
+_HTTPX_MISSING = 'Steps with "httpx" backend require httpx to be installed: pip install parsify[http2]'
 
 
 class Handbook:
+    __slots__ = ('handbook', '_parsers_by_scope')
+
     def __init__(self, book: str | dict):
-        self.handbook: dict = book if type(book) is dict else self.read_json(book)
+        self.handbook: dict = book if isinstance(book, dict) else self.read_json(book)
         self.__validate_handbook()
 
     @staticmethod
     def read_json(file: str):
-        with open(file=file, mode='r') as f:
-            return load(f)
+        with open(file=file, mode='rb') as f:
+            return orjson.loads(f.read())
 
     def __validate_handbook(self):
-        def raise_invalid_handbook():
-            raise Exception('Invalid Handbook.')
+        if not isinstance(self.handbook, dict) or not isinstance(self.handbook.get('parsers'), list):
+            raise ValueError('Invalid Handbook: "parsers" should be a list.')
 
-        step_musts = (
-            'name', 'chain_id',
-            'url', 'method',
-            'output_path', 'output'
-        )
-        step_optionals = (
-            'headers', 'parameters',
-            'payload', 'payload_type',
-            'dynamic_variables', 'iterables_order'
+        self._parsers_by_scope = dict()
+        for parser in self.handbook['parsers']:
+            self._compile_parser(parser=parser)
+
+            if parser['scope'] in self._parsers_by_scope:
+                raise ValueError(f'Invalid Handbook: duplicate parser scope "{parser["scope"]}".')
+            self._parsers_by_scope[parser['scope']] = parser
+
+    @staticmethod
+    def _compile_parser(parser: dict):
+        """Validate the parser, compile its steps and build the step and chain indexes.
+        :param parser: Parser dictionary, updated in place.
+        :return: None
+        """
+        if (not isinstance(parser, dict)
+                or not isinstance(parser.get('scope'), str)
+                or not isinstance(parser.get('steps'), list)):
+            raise ValueError('Invalid Handbook: parser should have "scope" string and "steps" list.')
+
+        for step in parser['steps']:
+            if not isinstance(step, dict):
+                raise ValueError(f'Invalid Handbook: steps of "{parser["scope"]}" should be dictionaries.')
+
+            Handbook._compile_step(step=step)
+
+        parser['_steps_by_name'] = dict()
+        for step in parser['steps']:
+            if step['name'] in parser['_steps_by_name']:
+                raise ValueError(f'Invalid Handbook: duplicate step name "{step["name"]}" in "{parser["scope"]}".')
+            parser['_steps_by_name'][step['name']] = step
+
+        chains = dict()
+        for step in parser['steps']:
+            chains.setdefault(step['chain_id'], []).append(step)
+        parser['_steps_by_chain'] = chains
+        parser['_chain_ids'] = sorted(chains)
+        parser['_concurrent_chains'] = {
+            chid for chid, chain in chains.items() if Handbook.__is_concurrent_chain(chain)
+        }
+
+    @staticmethod
+    def _compile_step(step: dict):
+        """Fill in the defaults of the step and precompile the data used on every request.
+        :param step: Step dictionary, updated in place.
+        :return: None
+        """
+        missing = _STEP_MUSTS - step.keys()
+        if missing:
+            raise ValueError(f'Invalid Handbook: step is missing required fields {sorted(missing)}.')
+
+        for k, v in _STEP_DEFAULTS.items():
+            step.setdefault(k, v)
+        for k, v in _OUTPUT_DEFAULTS.items():
+            step['output'].setdefault(k, v)
+        step['output'].setdefault('cacheable', step['method'].upper() == 'GET')
+        if step['dynamic_variables']:
+            for k, v in _DYNAMIC_VARIABLES_DEFAULTS.items():
+                step['dynamic_variables'].setdefault(k, v)
+
+        if step['backend'] not in _BACKENDS:
+            raise ValueError(f'Invalid Handbook: unknown backend "{step["backend"]}" of step "{step["name"]}".')
+
+        step['_output_path_parts'] = tuple(step['output_path'].split('.'))
+        step['_output_prefix'] = (
+            step['output_path'] if all(p and p != 'item' for p in step['_output_path_parts']) else None
         )
+        step['_payload_is_json'] = step['payload_type'] == 'json'
+        step['_payload_is_data'] = step['payload_type'] == 'data'
+        Handbook.__compile_dynamic_variables(step=step)
+
+    @staticmethod
+    def _iterable_keys(iterables: str | list | tuple | None) -> tuple:
+        """Flatten iterable name or list of names and lists of names into a tuple of names
+        """
+        if not iterables:
+            return tuple()
+        if isinstance(iterables, str):
+            return (iterables,)
 
-        if 'parsers' not in self.handbook:
-            raise_invalid_handbook()
-        if type(self.handbook['parsers']) is not list:
-            raise_invalid_handbook()
+        keys = list()
+        for it in iterables:
+            keys.extend([it] if isinstance(it, str) else it)
 
-        for parser in self.handbook['parsers']:
-            if 'scope' not in parser or 'steps' not in parser:
-                raise_invalid_handbook()
-            if type(parser['scope']) is not str or type(parser['steps']) is not list:
-                raise_invalid_handbook()
+        return tuple(keys)
+
+    @staticmethod
+    def __compile_dynamic_variables(step: dict):
+        """Flatten dynamic variables of the step into lookup tables:
+        iterables into {group: {key: (start, increment, cache source)}},
+        standard variables into [(field, key, cache source)] and
+        iterables order into tuples of keys to increment and to reset on every position
+        """
+        iterables_schema = dict()
+        standard_schema = list()
+
+        if step['dynamic_variables']:
+            for group, keys in (step['dynamic_variables']['iterables'] or dict()).items():
+                iterables_schema[group] = dict()
+                for k, v in keys.items():
+                    if isinstance(v, dict):
+                        iterables_schema[group][k] = (v.get('start', 0), v.get('increment', 1), None)
+                    else:
+                        iterables_schema[group][k] = (0, 1, v if isinstance(v, str) else None)
 
-            for step in parser['steps']:
-                if type(step) is not dict:
-                    raise_invalid_handbook()
+            for field, source in (step['dynamic_variables']['standard'] or dict()).items():
+                if not isinstance(source, dict):
+                    standard_schema.append((field, None, source))
+                else:
+                    standard_schema.extend((field, k, v) for k, v in source.items())
 
-                for mst in step_musts:
-                    if mst not in step:
-                        raise_invalid_handbook()
+        order = step['iterables_order'] or list()
 
-                for opt in step_optionals:
-                    if opt not in step:
-                        step[opt] = None
+        step['_iterables_schema'] = iterables_schema
+        step['_standard_schema'] = standard_schema
+        step['_dynamic_fields'] = tuple(
+            set(iterables_schema).union(field for field, k, _ in standard_schema if k is not None)
+        )
+        step['_iterables_order'] = tuple(Handbook._iterable_keys(it) for it in order)
+        step['_iterables_resets'] = tuple(Handbook._iterable_keys(order[:n]) for n in range(len(order)))
 
-                if step['dynamic_variables']:
-                    if 'iterables' not in step['dynamic_variables']:
-                        step['dynamic_variables']['iterables'] = None
-                    if 'standard' not in step['dynamic_variables']:
-                        step['dynamic_variables']['standard'] = None
+    @staticmethod
+    def __is_concurrent_chain(chain: list) -> bool:
+        """Check if steps of the chain can be executed at the same time:
+        there is more than one step, no iterables and no step reads results of another one
+        """
+        if len(chain) < 2 or chain[0]['iterables_order']:
+            return False
 
-                if 'is_chain_final' not in step['output']:
-                    step['output']['is_chain_final'] = False
-                if 'is_parser_final' not in step['output']:
-                    step['output']['is_parser_final'] = False
+        names = {step['name'] for step in chain}
+        for step in chain:
+            if step['_iterables_schema']:
+                return False
+            if names.intersection(source for _, _, source in step['_standard_schema']):
+                return False
 
-                if 'key' not in step['output']:
-                    step['output']['key'] = None
+        return True
 
     def __str__(self):
-        return dumps(self.handbook, indent=4)
+        handbook = {
+            **self.handbook,
+            'parsers': [
+                {
+                    **self.__public_fields(parser),
+                    'steps': [self.__public_fields(step) for step in parser['steps']]
+                }
+                for parser in self.handbook['parsers']
+            ]
+        }
+        return dumps(handbook, indent=4)
+
+    @staticmethod
+    def __public_fields(fields: dict) -> dict:
+        """Drop the fields precompiled during validation
+        """
+        return {k: v for k, v in fields.items() if not k.startswith('_')}
 
 
 class Engine(Handbook):
-    def __init__(self, handbook: Handbook | str | dict):
-        if type(handbook) is not Handbook:
+    __slots__ = (
+        'current_parser', 'current_step', 'results',
+        '_session', '_pool', '_http2_client', '_http2_client_lock', '_pool_manager',
+        '_response_cache', '_response_cache_lock', '_cache_size', '_cache_ttl',
+        '__current_cache', '__current_icfg'
+    )
+
+    def __init__(self, handbook: Handbook | str | dict, cache_size: int = 256, cache_ttl: float = None):
+        if not isinstance(handbook, Handbook):
             Handbook.__init__(self, book=handbook)
         else:
-            self.handbook: dict = handbook
+            self.handbook: dict = handbook.handbook
+            self._parsers_by_scope = handbook._parsers_by_scope
 
         self.current_parser: dict = self.handbook['parsers'][0]
         self.current_step: dict = self.current_parser['steps'][0]
 
         self.results = dict()
 
+        self._session = requests.Session()
+        retry = Retry(
+            total=5,
+            connect=3,
+            read=3,
+            status=_STATUS_RETRIES,
+            backoff_factor=_RETRY_BACKOFF,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=_RETRY_METHODS
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=retry)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._pool = ThreadPoolExecutor(max_workers=16)
+        self._pool_manager = urllib3.PoolManager(num_pools=16, maxsize=32, block=False, retries=retry)
+
+        if httpx is None and any(step['backend'] == 'httpx' for p in self.handbook['parsers'] for step in p['steps']):
+            raise ImportError(_HTTPX_MISSING)
+        # Created on the first httpx request, the holder is shared with forks so they reuse one client
+        self._http2_client = [None]
+        self._http2_client_lock = Lock()
+
+        self._response_cache = OrderedDict()
+        self._response_cache_lock = Lock()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
+
         self.__reset_cache()
         self.__reset_icfg()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Releases everything the engine holds: shuts down the step thread pool,
+        closes the requests session, clears the urllib3 pool manager and
+        closes the httpx client (if any), dropping all their pooled connections.
+        :return: None
+        """
+        self._pool.shutdown()
+        self._session.close()
+        self._pool_manager.clear()
+        if self._http2_client[0] is not None:
+            self._http2_client[0].close()
+            self._http2_client[0] = None
+
     def stepshot(
             self,
             step: str | dict = None,
@@ -98,18 +305,22 @@ class Engine(Handbook):
         :param increment_iterables: Iterables that should be incremented.
         :param reset_iterables: Iterables that should be reset.
         :return: Collected data list or -1 (stop status).
+        :raises requests.RequestException: If the request keeps failing after retries
+            (connection errors, timeouts, 429/502/503/504 responses of GET/HEAD/OPTIONS).
+            Steps with "urllib3" backend raise urllib3.exceptions.HTTPError
+            and steps with "httpx" backend raise httpx.HTTPError instead.
         """
         self.__set_step(step=step)
         self.__set_icfg(increment_iterables=increment_iterables, reset_iterables=reset_iterables)
 
         try:
-            self.__set_variables()
+            request = self.__set_variables()
         except IndexError:
             return -1
 
         try:
-            response = self.__send_request().json()
-        except (KeyError, TypeError, IndexError, requests.exceptions.JSONDecodeError):
+            response = self.__send_request(request=request)
+        except (KeyError, TypeError, IndexError, orjson.JSONDecodeError, ijson.JSONError):
             return -1
         else:
             if not response:
@@ -122,9 +333,14 @@ class Engine(Handbook):
         :param chain_id: ID of the chain that should be executed.
         :return: None
         """
-        steps = [step for step in self.current_parser['steps'] if step['chain_id'] == chain_id]
+        try:
+            steps = self.current_parser['_steps_by_chain'][chain_id]
+        except KeyError:
+            raise ValueError(f'Chain with the ID: "{chain_id}" could not be found.') from None
+
         s_len = len(steps)
-        iterables_order = steps[0]['iterables_order']
+        iterables_order = steps[0]['_iterables_order']
+        iterables_resets = steps[0]['_iterables_resets']
 
         self.__set_step(step=steps[0]['name'])
 
@@ -133,6 +349,8 @@ class Engine(Handbook):
         first_time = True
 
         if iterables_order:
+            self.__reset_icfg()
+
             while cur_it < len(iterables_order):
                 if first_time:
                     incr_its = None
@@ -140,7 +358,7 @@ class Engine(Handbook):
                     first_time = False
                 else:
                     incr_its = iterables_order[cur_it]
-                    reset_its = iterables_order[:cur_it]
+                    reset_its = iterables_resets[cur_it]
 
                 response = self.stepshot(
                     step=steps[nstep]['name'],
@@ -154,6 +372,8 @@ class Engine(Handbook):
                     cur_it = 0
 
                 nstep = (nstep + 1) if nstep < (s_len - 1) and response != -1 else 0
+        elif chain_id in self.current_parser['_concurrent_chains']:
+            list(self._pool.map(lambda st: self.__fork(share_cache=True).stepshot(step=st['name']), steps))
         else:
             for step in steps:
                 self.stepshot(step=step['name'])
@@ -168,151 +388,349 @@ class Engine(Handbook):
             If None, method will use the parser object from current_parser attribute.
         :return: Final data list collected from the parser.
         """
-        self.__reset_cache()
-        self.__set_parser(parser=parser)
+        self.__reset_response_cache()
+        return self.__run_scope(parser=parser)
 
-        chain_ids = sorted(list({step['chain_id'] for step in self.current_parser['steps']}))
+    def parse(self) -> dict:
+        """Runs all the parsers.
+        Scopes are executed concurrently, each in a worker thread by its own engine,
+        sharing the HTTP session (and its connection pool) of this one.
+        :return: Final dictionary of results collected from parsers.
+        """
+        scopes = [p['scope'] for p in self.handbook['parsers']]
+        self.__reset_response_cache()
 
-        for chid in chain_ids:
-            self.chainshot(chain_id=chid)
+        with ThreadPoolExecutor(max_workers=min(len(scopes), 16)) as executor:
+            results = list(executor.map(lambda scope: self.__fork().__run_scope(parser=scope), scopes))
+        self.results.update(zip(scopes, results))
 
-        return self.results[self.current_parser['scope']]
+        return self.results
 
-    def parse(self) -> dict:
-        """Runs all the parsers.
+    async def parse_async(self) -> dict:
+        """Runs all the parsers concurrently.
+        Every scope is executed in a worker thread by its own engine,
+        sharing the HTTP session (and its connection pool) of this one.
         :return: Final dictionary of results collected from parsers.
         """
+        loop = asyncio.get_running_loop()
         scopes = [p['scope'] for p in self.handbook['parsers']]
-        for scope in scopes:
-            self.scopeshot(parser=scope)
+        self.__reset_response_cache()
+
+        results = await asyncio.gather(*[
+            loop.run_in_executor(None, self.__fork().__run_scope, scope) for scope in scopes
+        ])
+        self.results.update(zip(scopes, results))
 
         return self.results
 
-    def __send_request(self) -> requests.Response:
-        return requests.request(
-            method=self.current_step['method'],
-            url=self.current_step['url'],
-            headers=self.current_step['headers'],
-            params=self.current_step['parameters'],
-            json=self.current_step['payload'] if self.current_step['payload_type'] == 'json' else None,
-            data=self.current_step['payload'] if self.current_step['payload_type'] == 'data' else None
+    def __run_scope(self, parser: str | dict | None) -> list:
+        """Run a full parser, keeping the responses cached by the current run
+        """
+        self.__reset_cache()
+        self.__set_parser(parser=parser)
+
+        for chid in self.current_parser['_chain_ids']:
+            self.chainshot(chain_id=chid)
+
+        return self.results[self.current_parser['scope']]
+
+    def __fork(self, share_cache: bool = False) -> 'Engine':
+        """Create an engine with its own state on top of the same handbook and session
+        :param share_cache: Collect step results into the cache of this engine.
+        """
+        engine = type(self).__new__(type(self))
+        engine.handbook = self.handbook
+        engine._parsers_by_scope = self._parsers_by_scope
+        engine.current_parser = self.current_parser
+        engine.current_step = self.current_step
+        engine.results = dict()
+        engine._session = self._session
+        engine._pool = self._pool
+        engine._http2_client = self._http2_client
+        engine._http2_client_lock = self._http2_client_lock
+        engine._pool_manager = self._pool_manager
+        engine._response_cache = self._response_cache
+        engine._response_cache_lock = self._response_cache_lock
+        engine._cache_size = self._cache_size
+        engine._cache_ttl = self._cache_ttl
+
+        if share_cache:
+            engine.__current_cache = self.__current_cache
+        else:
+            engine.__reset_cache()
+        engine.__reset_icfg()
+
+        return engine
+
+    def __send_request(self, request: dict) -> dict | list | None:
+        if self.current_step['output']['stream']:
+            return self.__stream_request(request=request)
+        if not self._cache_size or not self.current_step['output']['cacheable']:
+            return self.__decode(self.__fetch(request=request)[1])
+
+        key = self.__request_key(request=request)
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached and (self._cache_ttl is None or monotonic() - cached[0] < self._cache_ttl):
+                self._response_cache.move_to_end(key)
+                return self.__decode(cached[1])
+
+        status, content = self.__fetch(request=request)
+        if status < 400:
+            with self._response_cache_lock:
+                self._response_cache[key] = (monotonic(), content)
+                self._response_cache.move_to_end(key)
+                if len(self._response_cache) > self._cache_size:
+                    self._response_cache.popitem(last=False)
+
+        return self.__decode(content)
+
+    def __stream_request(self, request: dict) -> dict | list | None:
+        """Stream the response of a step with "stream" output and decode only the data under output path.
+        The rest of the body is drained afterwards so the connection goes back to the pool.
+        The data is returned wrapped back into its output path, streamed responses are never cached
+        """
+        prefix = self.current_step['_output_prefix']
+        if prefix is None or self.current_step['backend'] not in (None, 'requests'):
+            return self.__decode(self.__fetch(request=request)[1])
+
+        with self.__request(request=request, stream=True) as response:
+            size = response.headers.get('Content-Length', '')
+            if size.isdigit() and int(size) < 16 * 1024:
+                return self.__decode(response.content)
+
+            response.raw.decode_content = True
+            output = next(ijson.items(response.raw, prefix, use_float=True), None)
+            response.raw.drain_conn()
+
+        if output is None:
+            return None
+
+        for sub in reversed(self.current_step['_output_path_parts']):
+            output = {sub: output}
+
+        return output
+
+    @staticmethod
+    def __decode(content: bytes) -> dict | list | None:
+        """Decode raw response body, skipping the charset detection of Response.json()
+        """
+        return orjson.loads(content) if content else None
+
+    def __request_key(self, request: dict) -> bytes:
+        signature = dumps([
+            request['method'],
+            request['url'],
+            request['headers'],
+            request['parameters'],
+            self.current_step['payload_type'],
+            request['payload']
+        ], sort_keys=True, default=str)
+
+        return blake2b(signature.encode()).digest()
+
+    def __fetch(self, request: dict) -> tuple[int, bytes]:
+        """Send the request with the backend of the current step, return status code and raw body
+        """
+        if self.current_step['backend'] == 'urllib3':
+            response = self.__urllib3_request(request=request)
+            return response.status, response.data
+        if self.current_step['backend'] == 'httpx':
+            response = self.__httpx_request(request=request)
+            return response.status_code, response.content
+
+        response = self.__request(request=request)
+        return response.status_code, response.content
+
+    def __urllib3_request(self, request: dict) -> urllib3.HTTPResponse:
+        """Send the request straight through urllib3 pool manager, skipping requests' session machinery
+        """
+        url = request['url']
+        if request['parameters']:
+            query = urlencode({k: v for k, v in request['parameters'].items() if v is not None}, doseq=True)
+            url = f'{url}{"&" if "?" in url else "?"}{query}'
+
+        headers = dict(request['headers'] or dict())
+        payload = request['payload']
+        body = None
+
+        if payload is not None and self.current_step['_payload_is_json']:
+            body = orjson.dumps(payload)
+            headers.setdefault('Content-Type', 'application/json')
+        elif payload is not None and self.current_step['_payload_is_data']:
+            if isinstance(payload, dict):
+                body = urlencode(payload, doseq=True)
+                headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+            else:
+                body = payload
+
+        return self._pool_manager.request(
+            request['method'],
+            url,
+            body=body,
+            headers=headers,
+            timeout=urllib3.Timeout(connect=_TIMEOUT[0], read=_TIMEOUT[1])
+        )
+
+    def __get_http2_client(self) -> 'httpx.Client':
+        """Return the HTTP/2 client shared by this engine and its forks, creating it on first use
+        """
+        client = self._http2_client[0]
+        if client is not None:
+            return client
+
+        if httpx is None:
+            raise ImportError(_HTTPX_MISSING)
+
+        with self._http2_client_lock:
+            if self._http2_client[0] is None:
+                self._http2_client[0] = httpx.Client(
+                    transport=httpx.HTTPTransport(
+                        http2=True,
+                        retries=3,
+                        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+                    ),
+                    timeout=httpx.Timeout(_TIMEOUT[1], connect=_TIMEOUT[0])
+                )
+
+            return self._http2_client[0]
+
+    def __httpx_request(self, request: dict) -> 'httpx.Response':
+        """Send the request through HTTP/2 client. The transport retries failed connections,
+        429/502/503/504 responses of idempotent methods are retried here with the session's backoff
+        """
+        client = self.__get_http2_client()
+        payload = request['payload']
+        retry = request['method'].upper() in _RETRY_METHODS
+
+        for attempt in range(_STATUS_RETRIES + 1):
+            response = client.request(
+                method=request['method'],
+                url=request['url'],
+                headers=request['headers'],
+                params=request['parameters'],
+                json=payload if self.current_step['_payload_is_json'] else None,
+                data=payload if self.current_step['_payload_is_data'] and isinstance(payload, dict) else None,
+                content=payload if self.current_step['_payload_is_data'] and not isinstance(payload, dict) else None
+            )
+            if not retry or response.status_code not in _RETRY_STATUSES:
+                return response
+            if attempt < _STATUS_RETRIES:
+                sleep(_RETRY_BACKOFF * 2 ** attempt)
+
+        response.raise_for_status()
+
+    def __request(self, request: dict, stream: bool = False) -> requests.Response:
+        payload = request['payload']
+
+        return self._session.request(
+            method=request['method'],
+            url=request['url'],
+            headers=request['headers'],
+            params=request['parameters'],
+            json=payload if self.current_step['_payload_is_json'] else None,
+            data=payload if self.current_step['_payload_is_data'] else None,
+            timeout=_TIMEOUT,
+            stream=stream
         )
 
     def __set_parser(self, parser: str | dict | None):
         if parser:
-            if type(parser) is str:
-                for p in self.handbook['parsers']:
-                    if type(parser) is str and p['scope'] == parser:
-                        self.current_parser = p
-                        break
-                else:
-                    raise ValueError(f'Parser with the scope: "{parser}" could not be found.')
+            if isinstance(parser, str):
+                try:
+                    self.current_parser = self._parsers_by_scope[parser]
+                except KeyError:
+                    raise ValueError(f'Parser with the scope: "{parser}" could not be found.') from None
             else:
+                if '_chain_ids' not in parser:
+                    self._compile_parser(parser=parser)
                 self.current_parser = parser
 
     def __set_step(self, step: str | dict | None):
         if step:
-            if type(step) is str:
-                for s in self.current_parser['steps']:
-                    if type(step) is str and s['name'] == step:
-                        self.current_step = s
-                        break
-                else:
-                    raise ValueError(f'Step with the name: "{step}" could not be found.')
+            if isinstance(step, str):
+                try:
+                    self.current_step = self.current_parser['_steps_by_name'][step]
+                except KeyError:
+                    raise ValueError(f'Step with the name: "{step}" could not be found.') from None
             else:
+                if '_output_path_parts' not in step:
+                    self._compile_step(step=step)
                 self.current_step = step
 
     def __set_icfg(self, increment_iterables: list = None, reset_iterables: list = None):
-        if not self.current_step['dynamic_variables']:
+        schema = self.current_step['_iterables_schema']
+        if not schema:
             return
-        if not self.current_step['dynamic_variables']['iterables']:
+
+        icfg = self.__current_icfg
+        if not icfg:
+            for i, group in schema.items():
+                icfg[i] = {k: start for k, (start, _, _) in group.items()}
             return
 
-        if reset_iterables or not self.__current_icfg:
-            for i, v in self.current_step['dynamic_variables']['iterables'].items():
-                if not self.__current_icfg:
-                    self.__current_icfg[i] = dict()
+        if not isinstance(reset_iterables, tuple):
+            reset_iterables = self._iterable_keys(reset_iterables)
+        if not isinstance(increment_iterables, tuple):
+            increment_iterables = self._iterable_keys(increment_iterables)
 
-                    for k in v.keys():
-                        if type(v[k]) is not dict:
-                            self.__current_icfg[i][k] = 0
-                        else:
-                            self.__current_icfg[i][k] = v[k]['start']
-                else:
-                    for k in reset_iterables:
-                        k_list = list([k]) if type(k) is not list else k
-
-                        for j in k_list:
-                            if type(v[j]) is not dict:
-                                self.__current_icfg[i][j] = 0
-                            else:
-                                self.__current_icfg[i][j] = v[j]['start']
-        else:
-            for i, v in self.current_step['dynamic_variables']['iterables'].items():
-                if not increment_iterables:
-                    for k in v.keys():
-                        if type(v[k]) is not dict:
-                            self.__current_icfg[i][k] += 1
-                        else:
-                            self.__current_icfg[i][k] += v[k]['increment']
-                else:
-                    if type(increment_iterables) is str:
-                        iterables_list = list([increment_iterables])
-                    else:
-                        iterables_list = increment_iterables
-
-                    for it in iterables_list:
-                        its_list = list([it]) if type(it) is str else it
-                        for il in its_list:
-                            if type(v[il]) is not dict:
-                                self.__current_icfg[i][il] += 1
-                            else:
-                                self.__current_icfg[i][il] += v[il]['increment']
-
-    def __set_variables(self):
-        if not self.current_step['dynamic_variables']:
-            return
+        for i, group in schema.items():
+            values = icfg[i]
+            for k in reset_iterables:
+                values[k] = group[k][0]
 
-        iterables = self.current_step['dynamic_variables']['iterables']
-        standard = self.current_step['dynamic_variables']['standard']
+            if reset_iterables and not increment_iterables:
+                continue
 
-        if iterables:
-            for i in iterables.keys():
-                for k, v in iterables[i].items():
-                    if type(v) is str:
-                        self.current_step[i][k] = self.__current_cache[v][self.__current_icfg[i][k]]
-                    else:
-                        self.current_step[i][k] = self.__current_icfg[i][k]
-        if standard:
-            for s in standard.keys():
-                if type(standard[s]) is not dict:
-                    self.current_step[s] = self.__current_cache[standard[s]]
-                    continue
+            for k in increment_iterables or group:
+                values[k] += group[k][1]
+
+    def __set_variables(self) -> dict:
+        """Build request fields of the current step with dynamic variables applied,
+        handbook step itself is left untouched
+        """
+        step = self.current_step
+        icfg = self.__current_icfg
+        cache = self.__current_cache
+
+        request = {field: step[field] for field in ('method', 'url', 'headers', 'parameters', 'payload')}
+        for field in step['_dynamic_fields']:
+            request[field] = dict(step[field])
+
+        for i, group in step['_iterables_schema'].items():
+            fields = request[i]
+            values = icfg[i]
+            for k, (_, _, source) in group.items():
+                fields[k] = cache[source][values[k]] if source else values[k]
+
+        for field, k, source in step['_standard_schema']:
+            if k is None:
+                request[field] = cache[source]
+            else:
+                request[field][k] = cache[source]
 
-                for k, v in s.items():
-                    self.current_step[s][k] = self.__current_cache[v]
+        return request
 
     def __list_handler(self, response: list) -> list:
-        result = list()
-        for elem in response:
-            if not self.current_step['output']['key']:
-                result.append(elem)
-            elif self.current_step['output']['key'] in elem:
-                result.append(elem[self.current_step['output']['key']])
-
-        if (self.current_step['output']['is_chain_final']
-                and self.current_step['name'] in self.__current_cache):
-            self.__current_cache[self.current_step['name']] += result
+        key = self.current_step['output']['key']
+        if not key:
+            result = list(response)
+        else:
+            result = [elem[key] for elem in response if key in elem]
+
+        name = self.current_step['name']
+        cache = self.__current_cache
+        if self.current_step['output']['is_chain_final'] and name in cache:
+            cache[name].extend(result)
         else:
-            self.__current_cache[self.current_step['name']] = result
+            cache[name] = result
 
         return result
 
     def __output_handler(self, response: list):
-        address = self.current_step['output_path'].split('.')
         output = response
 
-        for sub in address:
+        for sub in self.current_step['_output_path_parts']:
             try:
                 output = output[sub]
             except (KeyError, TypeError, IndexError):
@@ -325,6 +743,12 @@ class Engine(Handbook):
         """
         self.__current_icfg = dict()
 
+    def __reset_response_cache(self):
+        """Drop responses cached by the previous run
+        """
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
     def __reset_cache(self):
         """Reset cache
         """